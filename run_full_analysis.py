@@ -8,61 +8,73 @@ Runs as daily cron at 9 AM UK
 import os
 import sys
 import json
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
 
-# Add skills to path - use absolute paths
-SCRIPT_DIR = Path(__file__).parent.resolve()
-SKILLS_DIR = SCRIPT_DIR / "skills"
-PORTFOLIO_DIR = SCRIPT_DIR
+# orjson serializes several times faster than stdlib json and handles
+# datetimes natively; fall back to json when it isn't installed
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+
+def write_json(path, obj):
+    """Dump obj to path as indented JSON (orjson when available)"""
+    if HAS_ORJSON:
+        Path(path).write_bytes(orjson.dumps(
+            obj,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY,
+            default=str
+        ))
+    else:
+        with open(path, "w") as f:
+            json.dump(obj, f, indent=2, default=str)
 
-# Add to path
-sys.path.insert(0, str(SKILLS_DIR / "fundamental_extraction"))
-sys.path.insert(0, str(SKILLS_DIR / "visual_intelligence"))
-sys.path.insert(0, str(SKILLS_DIR / "synthesis_agent"))
-sys.path.insert(0, str(PORTFOLIO_DIR))
 
-# Import core tracker
-from tracker import analyze_portfolio, format_report, send_to_discord
+def read_json(path):
+    """Load JSON from path (orjson when available)"""
+    if HAS_ORJSON:
+        return orjson.loads(Path(path).read_bytes())
+    with open(path) as f:
+        return json.load(f)
 
-# Import skills (direct imports)
-sys.path.insert(0, str(SKILLS_DIR / "fundamental_extraction"))
-sys.path.insert(0, str(SKILLS_DIR / "visual_intelligence"))
-sys.path.insert(0, str(SKILLS_DIR / "synthesis_agent"))
-
-# Import fundamental extraction directly
-import importlib.util
-spec = importlib.util.spec_from_file_location("fundamental_extraction", SKILLS_DIR / "fundamental_extraction" / "main.py")
-fundamental_extraction = importlib.util.module_from_spec(spec)
-spec.loader.exec_module(fundamental_extraction)
-extract_fundamentals = fundamental_extraction.extract_fundamentals
+SCRIPT_DIR = Path(__file__).parent.resolve()
 
-spec = importlib.util.spec_from_file_location("visual_intelligence", SKILLS_DIR / "visual_intelligence" / "main.py")
-visual_intelligence = importlib.util.module_from_spec(spec)
-spec.loader.exec_module(visual_intelligence)
-generate_all_charts = visual_intelligence.generate_all_charts
-get_chart_for_discord = visual_intelligence.get_chart_for_discord
+# Make tracker/skills importable when invoked from outside the project dir
+sys.path.insert(0, str(SCRIPT_DIR))
 
-spec = importlib.util.spec_from_file_location("synthesis_agent", SKILLS_DIR / "synthesis_agent" / "main.py")
-synthesis_agent = importlib.util.module_from_spec(spec)
-spec.loader.exec_module(synthesis_agent)
-synthesize_portfolio = synthesis_agent.synthesize_portfolio
-format_synthesis_message = synthesis_agent.format_synthesis_message
+# Plain package imports - unlike the old importlib.spec_from_file_location
+# blocks these use CPython's bytecode cache, so the cron job doesn't
+# re-parse every skill's source on each start
+from tracker import analyze_portfolio, format_report, send_to_discord
+from skills.fundamental_extraction.main import extract_fundamentals
+from skills.visual_intelligence.main import generate_all_charts, get_chart_for_discord
+from skills.synthesis_agent.main import synthesize_portfolio, format_synthesis_message
 
 
 def find_rsi_alerts(holdings: list) -> list:
     """Find stocks with RSI extremes that need fundamental extraction"""
-    alerts = []
-    for h in holdings:
-        rsi = h.get("indicators", {}).get("rsi", 50)
-        if rsi > 65 or rsi < 35:
-            alerts.append({
-                "ticker": h["ticker"],
-                "company": h["company"],
-                "signal": h.get("signal", ""),
-                "rsi": rsi
-            })
-    return alerts
+    if not holdings:
+        return []
+    # One vectorized comparison over every holding's RSI instead of
+    # per-dict Python branching
+    rsi = np.fromiter(
+        (h.get("indicators", {}).get("rsi", 50) for h in holdings),
+        dtype=np.float64, count=len(holdings)
+    )
+    return [
+        {
+            "ticker": holdings[i]["ticker"],
+            "company": holdings[i]["company"],
+            "signal": holdings[i].get("signal", ""),
+            "rsi": float(rsi[i])
+        }
+        for i in np.where((rsi > 65) | (rsi < 35))[0]
+    ]
 
 
 def run_full_analysis() -> dict:
@@ -82,8 +94,7 @@ def run_full_analysis() -> dict:
     
     # Save the report
     report_file = SCRIPT_DIR / "daily_report.json"
-    with open(report_file, "w") as f:
-        json.dump(report, f, indent=2, default=str)
+    write_json(report_file, report)
     
     results["steps"]["technical"] = {
         "status": "success",
@@ -92,40 +103,57 @@ def run_full_analysis() -> dict:
     }
     print(f"   ✓ Analyzed {len(report.get('holdings', []))} holdings (£{report.get('portfolio_value', 0):,.2f})")
     
-    # Step 2: Find RSI alerts and extract fundamentals
-    print("\n[2/4] Checking for RSI alerts and extracting fundamentals...")
+    # Steps 2 and 3 are independent of each other (fundamentals feed the
+    # synthesis step, charts only read portfolio_split.json from step 1),
+    # so overlap them instead of serializing the whole pipeline
+    print("\n[2+3/4] Extracting fundamentals and generating visualizations...")
     holdings = report.get("holdings", [])
     rsi_alerts = find_rsi_alerts(holdings)
-    
-    fundamentals_extracted = []
-    for alert in rsi_alerts:
-        print(f"   → Extracting fundamentals for {alert['ticker']} (RSI: {alert['rsi']})...")
-        try:
-            result = extract_fundamentals(alert["ticker"], alert["company"], alert["signal"])
-            if result.get("status") == "success":
-                fundamentals_extracted.append(alert["ticker"])
-        except Exception as e:
-            print(f"   ⚠ Error: {e}")
-    
-    results["steps"]["fundamentals"] = {
-        "status": "success",
-        "alerts_found": len(rsi_alerts),
-        "extracted": fundamentals_extracted
-    }
-    print(f"   ✓ Extracted fundamentals for {len(fundamentals_extracted)} stocks")
-    
-    # Step 3: Generate visualizations
-    print("\n[3/4] Generating visualizations...")
-    try:
-        charts = generate_all_charts()
-        results["steps"]["visual"] = {
+
+    def run_fundamentals() -> list:
+        # Each extraction is dominated by Tavily HTTP + PDF download, so fan
+        # the alerts out over a thread pool instead of paying the latencies
+        # serially
+        extracted = []
+        if rsi_alerts:
+            for alert in rsi_alerts:
+                print(f"   → Extracting fundamentals for {alert['ticker']} (RSI: {alert['rsi']})...")
+            with ThreadPoolExecutor(max_workers=min(8, len(rsi_alerts))) as ex:
+                futures = {
+                    ex.submit(extract_fundamentals, a["ticker"], a["company"], a["signal"]): a
+                    for a in rsi_alerts
+                }
+                for fut in as_completed(futures):
+                    try:
+                        result = fut.result()
+                        if result.get("status") == "success":
+                            extracted.append(futures[fut]["ticker"])
+                    except Exception as e:
+                        print(f"   ⚠ Error: {e}")
+        return extracted
+
+    with ThreadPoolExecutor(max_workers=2) as stage_ex:
+        fundamentals_fut = stage_ex.submit(run_fundamentals)
+        charts_fut = stage_ex.submit(generate_all_charts)
+
+        fundamentals_extracted = fundamentals_fut.result()
+        results["steps"]["fundamentals"] = {
             "status": "success",
-            "charts": list(charts.get("charts", {}).keys())
+            "alerts_found": len(rsi_alerts),
+            "extracted": fundamentals_extracted
         }
-        print(f"   ✓ Generated: {', '.join(results['steps']['visual']['charts'])}")
-    except Exception as e:
-        print(f"   ⚠ Visual generation error: {e}")
-        results["steps"]["visual"] = {"status": "error", "error": str(e)}
+        print(f"   ✓ Extracted fundamentals for {len(fundamentals_extracted)} stocks")
+
+        try:
+            charts = charts_fut.result()
+            results["steps"]["visual"] = {
+                "status": "success",
+                "charts": list(charts.get("charts", {}).keys())
+            }
+            print(f"   ✓ Generated: {', '.join(results['steps']['visual']['charts'])}")
+        except Exception as e:
+            print(f"   ⚠ Visual generation error: {e}")
+            results["steps"]["visual"] = {"status": "error", "error": str(e)}
     
     # Step 4: Synthesis
     print("\n[4/4] Running synthesis analysis...")
@@ -144,8 +172,7 @@ def run_full_analysis() -> dict:
     
     # Save full results
     output_file = SCRIPT_DIR / "full_analysis.json"
-    with open(output_file, "w") as f:
-        json.dump(results, f, indent=2, default=str)
+    write_json(output_file, results)
     
     print("\n" + "="*60)
     print("ANALYSIS COMPLETE")
@@ -155,32 +182,27 @@ def run_full_analysis() -> dict:
 
 
 def send_discord_update(report: dict, synthesis: dict, charts: dict):
-    """Send comprehensive update to Discord"""
-    messages = []
-    
-    # 1. Technical Report
+    """Send comprehensive update to Discord in as few requests as possible"""
     tech_message = format_report(report)
-    messages.append(tech_message)
-    
-    # 2. Synthesis Summary
     synth_message = format_synthesis_message(synthesis)
-    messages.append(synth_message)
-    
-    # Send messages
-    for msg in messages:
-        send_to_discord(msg)
-    
-    # Send chart images
+
+    # Coalesce both reports into one message when they fit under Discord's
+    # 2000-char content limit
+    combined = tech_message + "\n\n---\n\n" + synth_message
+    if len(combined) <= 2000:
+        messages = [combined]
+    else:
+        messages = [tech_message, synth_message]
+
+    # Attach both charts to the first message - a single multipart request
+    # instead of one POST per message plus one per image
     chart_paths = [
-        get_chart_for_discord("sector"),
-        get_chart_for_discord("pie")
+        p for p in (get_chart_for_discord("sector"), get_chart_for_discord("pie")) if p
     ]
-    
-    for path in chart_paths:
-        if path:
-            # Would send image attachment here
-            print(f"   [Discord] Would send chart: {path}")
-    
+    send_to_discord(messages[0], file_paths=chart_paths)
+    for msg in messages[1:]:
+        send_to_discord(msg)
+
     return messages
 
 
@@ -195,10 +217,8 @@ if __name__ == "__main__":
     synthesis_file = SCRIPT_DIR / "synthesis_report.json"
     
     if report_file.exists() and synthesis_file.exists():
-        with open(report_file) as f:
-            report = json.load(f)
-        with open(synthesis_file) as f:
-            synthesis = json.load(f)
+        report = read_json(report_file)
+        synthesis = read_json(synthesis_file)
         
         # Send to Discord
         print("\nSending to Discord...")
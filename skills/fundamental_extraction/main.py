@@ -5,44 +5,122 @@ Triggered when stocks are flagged technically (RSI extremes)
 Finds latest 10-Q/10-K PDF and extracts key metrics
 """
 
+import functools
+import hashlib
+import io
 import os
 import json
 import re
-import tempfile
-import requests
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
 
-# Try pdfplumber first, fall back to PyPDF2
-try:
-    import pdfplumber
-    HAS_PDFPLUMBER = True
-except ImportError:
-    HAS_PDFPLUMBER = False
+# requests, tavily and the PDF parsers are imported lazily inside the
+# functions that need them - on no-alert days run_full_analysis imports this
+# module without ever extracting anything, and pdfplumber's pdfminer chain
+# alone is the slowest import here
 
+# orjson serializes much faster than stdlib json; optional
 try:
-    from PyPDF2 import PdfReader
-    HAS_PYPDF2 = True
+    import orjson
+    HAS_ORJSON = True
 except ImportError:
-    HAS_PYPDF2 = False
-
-import tavily
+    HAS_ORJSON = False
 
 # Config
 TAVILY_API_KEY = os.getenv("TAVILY_API_KEY", "")
+MAX_PDF_BYTES = 25_000_000  # abort downloads past this - filings are way smaller
 OUTPUT_DIR = Path(__file__).parent.parent.parent / "fundamentals"
 OUTPUT_DIR.mkdir(exist_ok=True)
 
+# Extracted-text cache keyed by URL hash - the daily cron would otherwise
+# re-download and re-parse the same quarterly filing every run
+PDF_CACHE_DIR = OUTPUT_DIR / ".pdfcache"
+PDF_CACHE_DIR.mkdir(exist_ok=True)
+PDF_CACHE_MAX_AGE = 30 * 86400  # seconds; filings change quarterly at most
+
 # SEC EDGAR as fallback source
 SEC_BASE_URL = "https://www.sec.gov/cgi-bin/browse-edgar"
 
+@functools.cache
+def _get_session():
+    """Shared HTTP session, built on first use - keeps pooled connections
+    alive so multiple PDF downloads (often from the same IR/SEC CDN) skip
+    repeat TCP+TLS handshakes"""
+    import requests
+    session = requests.Session()
+    session.headers.update({
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+    })
+    return session
+
+
+@functools.cache
+def _pdf_backend():
+    """Best available PDF parser: PyMuPDF (C-backed, fastest), then
+    pdfplumber, then PyPDF2. Probed on first use, not at import."""
+    try:
+        import fitz  # PyMuPDF
+        return ("pymupdf", fitz)
+    except ImportError:
+        pass
+    try:
+        import pdfplumber
+        return ("pdfplumber", pdfplumber)
+    except ImportError:
+        pass
+    try:
+        from PyPDF2 import PdfReader
+        return ("pypdf2", PdfReader)
+    except ImportError:
+        return (None, None)
+
+# Financial statement patterns - compiled once at module load, and all
+# metrics folded into one alternation with named groups so parse_financials
+# traverses the extracted text a single time instead of once per pattern
+def _billions(name: str) -> str:
+    return r"[:\s]+[\$]?(?P<" + name + r"_val>[\d]+\.?[\d]*)\s*(?:billion|B)"
+
+FINANCIAL_RE = re.compile(
+    r"(?P<revenue>(?:(?:Total\s+)?Revenue|Net\s+Sales|Product\s+Revenue|Service\s+Revenue)" + _billions("revenue") + r")"
+    r"|(?P<cogs>Cost\s+of\s+(?:Revenue|Products|Sales)" + _billions("cogs") + r")"
+    r"|(?P<op_income>Operating\s+(?:Income|Profit)" + _billions("op_income") + r")"
+    r"|(?P<net_income>Net\s+(?:Income|Earnings|Profit)" + _billions("net_income") + r")"
+    r"|(?P<eps>(?:(?:Diluted\s+)?EPS|Earnings\s+per\s+Share)[:\s]+[\$]?(?P<eps_val>[\d]+\.?[\d]*))",
+    re.IGNORECASE)
+
+# named group -> (metrics key, value is in billions/millions)
+FINANCIAL_KEYS = {
+    "revenue": ("revenue_billions", True),
+    "cogs": ("cogs_billions", True),
+    "op_income": ("operating_income_billions", True),
+    "net_income": ("net_income_billions", True),
+    "eps": ("eps", False),
+}
+
+# Cheap screen keywords: every FINANCIAL_RE alternative contains one of
+# these, so text without any of them can skip the regex suite entirely
+FINANCIAL_ANCHORS = (
+    "revenue", "net sales", "net income", "net earnings", "net profit",
+    "operating income", "operating profit", "eps", "earnings per share",
+)
+
+# Guidance needs surrounding context (.*?) so it keeps its own patterns
+GUIDANCE_RE = tuple(re.compile(p, re.IGNORECASE) for p in (
+    r'(?:FY|Full\s+Year)\s*(?:2024|2025)?\s*(?:EPS|earnings).*?(?:guidance|outlook|expected)[:\s]+[\$]?([\d]+\.?[\d]*)',
+    r'(?:Forward|Estimated)\s+EPS[:\s]+[\$]?([\d]+\.?[\d]*)',
+    r'202[45]\s*(?:EPS|earnings).*?guidance[:\s]+[\$]?([\d]+\.?[\d]*)',
+))
+
 
 def search_ir_pdf(ticker: str, company_name: str) -> dict:
     """Search for Investor Relations PDF using Tavily"""
     if not TAVILY_API_KEY:
         return {"error": "No Tavily API key"}
-    
+
     try:
+        import tavily
         client = tavily.TavilyClient(api_key=TAVILY_API_KEY)
         
         # Search for 10-K first, then 10-Q
@@ -83,85 +161,123 @@ def search_ir_pdf(ticker: str, company_name: str) -> dict:
 def extract_text_from_pdf(url: str) -> str:
     """Download and extract text from PDF"""
     text = ""
-    
+
+    backend, parser = _pdf_backend()
+    if backend is None:
+        print("No PDF parser installed (pymupdf/pdfplumber/PyPDF2)")
+        return ""
+
     try:
-        # Download PDF
-        headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
-        resp = requests.get(url, headers=headers, timeout=30)
-        
+        # Download PDF over the pooled session, streamed so we can abort
+        # early instead of buffering a mislabelled 200MB HTML page
+        resp = _get_session().get(url, timeout=30, stream=True)
+
         if resp.status_code != 200:
             return ""
-        
-        # Save to temp file
-        with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as f:
-            f.write(resp.content)
-            temp_path = f.name
-        
+
+        # A search hit that isn't actually a PDF (IR landing page, proxy
+        # statement viewer) just wastes bandwidth - skip it up front.
+        # Octet-stream is allowed since some IR CDNs serve PDFs that way.
+        content_type = resp.headers.get("Content-Type", "").lower()
+        if content_type and "pdf" not in content_type and "octet-stream" not in content_type:
+            print(f"PDF download skipped ({url}: {content_type})")
+            return ""
+
+        buf = bytearray()
+        for chunk in resp.iter_content(65536):
+            buf.extend(chunk)
+            if len(buf) > MAX_PDF_BYTES:
+                print(f"PDF download aborted (>{MAX_PDF_BYTES // 1_000_000}MB): {url}")
+                return ""
+
+        # Parse straight from memory - no temp file round-trip
+        pdf_bytes = bytes(buf)
+
         # Extract text
-        if HAS_PDFPLUMBER:
-            with pdfplumber.open(temp_path) as pdf:
-                for page in pdf.pages[:20]:  # First 20 pages (usually covers)
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += page_text + "\n"
-        elif HAS_PYPDF2:
-            reader = PdfReader(temp_path)
-            for page in reader.pages[:20]:
-                page_text = page.extract_text()
-                if page_text:
-                    text += page_text + "\n"
-        
-        # Cleanup
-        os.unlink(temp_path)
-        
+        if backend == "pymupdf":
+            # MuPDF is not thread-safe across pages of one document, and
+            # batch_extract already fans whole PDFs out over a pool, so
+            # pull the pages serially like the fallback parsers
+            doc = parser.open(stream=pdf_bytes, filetype="pdf")
+            try:
+                text = "\n".join(
+                    doc.load_page(i).get_text("text")
+                    for i in range(min(20, doc.page_count))
+                )
+            finally:
+                doc.close()
+        elif backend == "pdfplumber":
+            # First 20 pages (usually covers); join once instead of
+            # quadratic text += per page
+            with parser.open(io.BytesIO(pdf_bytes)) as pdf:
+                text = "\n".join(
+                    page_text
+                    for page_text in (page.extract_text() for page in pdf.pages[:20])
+                    if page_text
+                )
+        else:  # PyPDF2 - parser is the PdfReader class
+            reader = parser(io.BytesIO(pdf_bytes))
+            text = "\n".join(
+                page_text
+                for page_text in (page.extract_text() for page in reader.pages[:20])
+                if page_text
+            )
+
     except Exception as e:
         print(f"PDF extraction error: {e}")
     
     return text
 
 
+def get_pdf_text(url: str) -> str:
+    """Extract PDF text, served from the URL-keyed disk cache when fresh"""
+    cache_file = PDF_CACHE_DIR / (hashlib.md5(url.encode()).hexdigest() + ".txt")
+    try:
+        if cache_file.exists() and time.time() - cache_file.stat().st_mtime < PDF_CACHE_MAX_AGE:
+            return cache_file.read_text()
+    except OSError:
+        pass
+
+    text = extract_text_from_pdf(url)
+    if text:
+        try:
+            cache_file.write_text(text)
+        except OSError as e:
+            print(f"PDF cache write failed: {e}")
+    return text
+
+
 def parse_financials(text: str, ticker: str) -> dict:
     """Parse key financial metrics from extracted text"""
     metrics = {}
-    
+
+    # Not an earnings report (e.g. a proxy statement cover slipped through
+    # the search)? Bail out with microsecond substring checks instead of
+    # running the regex suite over the whole text.
+    low = text.lower()
+    if not any(anchor in low for anchor in FINANCIAL_ANCHORS):
+        return metrics
+
     # Clean text
     text = text.replace(',', '').replace('$', '').replace('(', '-').replace(')', '')
-    
-    # Revenue patterns (look for billions/millions)
-    revenue_patterns = [
-        r'(?:Total\s+)?Revenue[:\s]+[\$]?([\d]+\.?[\d]*)\s*(?:billion|B)',
-        r'Net\s+Sales[:\s]+[\$]?([\d]+\.?[\d]*)\s*(?:billion|B)',
-        r'Product\s+Revenue[:\s]+[\$]?([\d]+\.?[\d]*)\s*(?:billion|B)',
-        r'Service\s+Revenue[:\s]+[\$]?([\d]+\.?[\d]*)\s*(?:billion|B)',
-    ]
-    
-    for pattern in revenue_patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            val = float(match.group(1))
-            # Normalize to billions
-            if val < 100:  # Probably already in billions
-                metrics['revenue_billions'] = val
-            else:  # Probably in millions
-                metrics['revenue_billions'] = val / 1000
-            break
-    
-    # COGS / Cost of Revenue
-    cogs_patterns = [
-        r'Cost\s+of\s+(?:Revenue|Products|Sales)[:\s]+[\$]?([\d]+\.?[\d]*)\s*(?:billion|B)',
-        r'Cost\s+of\s+Revenue[:\s]+[\$]?([\d]+\.?[\d]*)\s*(?:billion|B)',
-    ]
-    
-    for pattern in cogs_patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            val = float(match.group(1))
-            if val < 100:
-                metrics['cogs_billions'] = val
-            else:
-                metrics['cogs_billions'] = val / 1000
+
+    def to_billions(val: float) -> float:
+        # Values < 100 are probably already in billions, else millions
+        return val if val < 100 else val / 1000
+
+    # One pass over the text for all metrics; first match per metric wins
+    for match in FINANCIAL_RE.finditer(text):
+        kind = match.lastgroup
+        if kind.endswith("_val"):
+            kind = kind[:-4]
+        key, in_billions = FINANCIAL_KEYS[kind]
+        if key in metrics:
+            continue
+        val = float(match.group(kind + "_val"))
+        metrics[key] = to_billions(val) if in_billions else val
+        if len(metrics) == len(FINANCIAL_KEYS):
             break
-    
+
     # Gross Profit
     if 'revenue_billions' in metrics and 'cogs_billions' in metrics:
         metrics['gross_profit_billions'] = metrics['revenue_billions'] - metrics['cogs_billions']
@@ -169,58 +285,14 @@ def parse_financials(text: str, ticker: str) -> dict:
             metrics['gross_margin_pct'] = round(
                 metrics['gross_profit_billions'] / metrics['revenue_billions'] * 100, 1
             )
-    
-    # Operating Income
-    op_income_patterns = [
-        r'Operating\s+Income[:\s]+[\$]?([\d]+\.?[\d]*)\s*(?:billion|B)',
-        r'Operating\s+Profit[:\s]+[\$]?([\d]+\.?[\d]*)\s*(?:billion|B)',
-    ]
-    
-    for pattern in op_income_patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            val = float(match.group(1))
-            metrics['operating_income_billions'] = val if val < 100 else val / 1000
-            break
-    
-    # Net Income
-    net_income_patterns = [
-        r'Net\s+Income[:\s]+[\$]?([\d]+\.?[\d]*)\s*(?:billion|B)',
-        r'Net\s+(?:Earnings|Profit)[:\s]+[\$]?([\d]+\.?[\d]*)\s*(?:billion|B)',
-    ]
-    
-    for pattern in net_income_patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            val = float(match.group(1))
-            metrics['net_income_billions'] = val if val < 100 else val / 1000
-            break
-    
-    # EPS
-    eps_patterns = [
-        r'(?:Diluted\s+)?EPS[:\s]+[\$]?([\d]+\.?[\d]*)',
-        r'Earnings\s+per\s+Share[:\s]+[\$]?([\d]+\.?[\d]*)',
-    ]
-    
-    for pattern in eps_patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            metrics['eps'] = float(match.group(1))
-            break
-    
+
     # EPS Guidance / Forward EPS
-    guidance_patterns = [
-        r'(?:FY|Full\s+Year)\s*(?:2024|2025)?\s*(?:EPS|earnings).*?(?:guidance|outlook|expected)[:\s]+[\$]?([\d]+\.?[\d]*)',
-        r'(?:Forward|Estimated)\s+EPS[:\s]+[\$]?([\d]+\.?[\d]*)',
-        r'202[45]\s*(?:EPS|earnings).*?guidance[:\s]+[\$]?([\d]+\.?[\d]*)',
-    ]
-    
-    for pattern in guidance_patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
+    for rx in GUIDANCE_RE:
+        match = rx.search(text)
         if match:
             metrics['eps_guidance'] = float(match.group(1))
             break
-    
+
     return metrics
 
 
@@ -250,7 +322,7 @@ def extract_fundamentals(ticker: str, company_name: str, signal: str = "") -> di
     # Step 2: If PDF found, extract text
     if search_result.get("source") == "tavily" and ".pdf" in search_result.get("url", "").lower():
         print(f"[Fundamentals] Downloading PDF from {search_result['url']}")
-        text = extract_text_from_pdf(search_result["url"])
+        text = get_pdf_text(search_result["url"])
         
         if text:
             # Step 3: Parse financials
@@ -266,18 +338,28 @@ def extract_fundamentals(ticker: str, company_name: str, signal: str = "") -> di
     
     # Save to file
     output_file = OUTPUT_DIR / f"{ticker}.json"
-    with open(output_file, "w") as f:
-        json.dump(result, f, indent=2)
+    if HAS_ORJSON:
+        output_file.write_bytes(orjson.dumps(result, option=orjson.OPT_INDENT_2))
+    else:
+        with open(output_file, "w") as f:
+            json.dump(result, f, indent=2)
     
     print(f"[Fundamentals] Saved to {output_file}")
     return result
 
 
 def batch_extract(tickers: list) -> dict:
-    """Extract fundamentals for multiple tickers"""
+    """Extract fundamentals for multiple tickers concurrently (I/O-bound)"""
+    if not tickers:
+        return {}
     results = {}
-    for ticker, company_name, signal in tickers:
-        results[ticker] = extract_fundamentals(ticker, company_name, signal)
+    with ThreadPoolExecutor(max_workers=min(8, len(tickers))) as ex:
+        futures = {
+            ex.submit(extract_fundamentals, ticker, company_name, signal): ticker
+            for ticker, company_name, signal in tickers
+        }
+        for fut in as_completed(futures):
+            results[futures[fut]] = fut.result()
     return results
 
 
@@ -10,6 +10,13 @@ import json
 from datetime import datetime
 from pathlib import Path
 
+# orjson parses/serializes much faster than stdlib json; optional
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 # Import from parent modules
 TRACKER_DIR = Path(__file__).parent.parent.parent
 REPORT_FILE = TRACKER_DIR / "daily_report.json"
@@ -17,6 +24,30 @@ FUNDAMENTALS_DIR = TRACKER_DIR / "fundamentals"
 OUTPUT_FILE = TRACKER_DIR / "synthesis_report.json"
 
 
+# Optional numba JIT for the numeric scoring core - the identity decorator
+# keeps the plain-Python path working when numba isn't installed
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+    def njit(*args, **kwargs):
+        def wrap(func):
+            return func
+        if args and callable(args[0]):
+            return args[0]
+        return wrap
+
+# Optional Aho-Corasick automaton - scans an article for every keyword in
+# one pass instead of one substring search per keyword
+try:
+    import ahocorasick
+    HAS_AHOCORASICK = True
+except ImportError:
+    HAS_AHOCORASICK = False
+
+
 # Weights for confidence scoring
 WEIGHTS = {
     "technical": 0.40,
@@ -24,12 +55,33 @@ WEIGHTS = {
     "sentiment": 0.25
 }
 
+# Sentiment keywords
+POSITIVE_KEYWORDS = ["beat", "raise", "growth", "bullish", "upgrade", "profit", "soar", "rally", "record"]
+NEGATIVE_KEYWORDS = ["miss", "cut", "downgrade", "loss", "fear", "crash", "plunge", "warning", "layoff"]
+
+if HAS_AHOCORASICK:
+    _KEYWORD_AUTOMATON = ahocorasick.Automaton()
+    for kw in POSITIVE_KEYWORDS:
+        _KEYWORD_AUTOMATON.add_word(kw, "pos")
+    for kw in NEGATIVE_KEYWORDS:
+        _KEYWORD_AUTOMATON.add_word(kw, "neg")
+    _KEYWORD_AUTOMATON.make_automaton()
+else:
+    _KEYWORD_AUTOMATON = None
+
+
+def _read_json(path: Path) -> dict:
+    """Load a JSON file (orjson when available)"""
+    if HAS_ORJSON:
+        return orjson.loads(path.read_bytes())
+    with open(path) as f:
+        return json.load(f)
+
 
 def load_daily_report() -> dict:
     """Load technical analysis report"""
     if REPORT_FILE.exists():
-        with open(REPORT_FILE) as f:
-            return json.load(f)
+        return _read_json(REPORT_FILE)
     return {}
 
 
@@ -37,174 +89,214 @@ def load_fundamentals(ticker: str) -> dict:
     """Load fundamentals JSON for a ticker"""
     fund_file = FUNDAMENTALS_DIR / f"{ticker}.json"
     if fund_file.exists():
-        with open(fund_file) as f:
-            return json.load(f)
+        return _read_json(fund_file)
     return {}
 
 
+@njit(cache=True)
+def _tech_score_core(rsi, macd_hist, price, sma_20, sma_50,
+                     n_overbought, n_oversold, n_bullish, n_bearish):
+    """Pure numeric scoring core - JIT-compiled when numba is available.
+
+    Every adjustment is a decimal tenth, so the math runs in integer
+    tenths (50 == 5.0) and the caller divides by 10 once at the end.
+    """
+    score = 50  # Start neutral
+
+    # RSI scoring (oversold = potential upside)
+    if 40 <= rsi <= 60:
+        score += 15
+    elif rsi < 30:
+        score += 30
+    elif rsi < 40:
+        score += 15
+    elif rsi > 75:
+        score -= 30
+    elif rsi > 65:
+        score -= 15
+
+    # MACD scoring
+    if macd_hist > 0:
+        score += 10
+    else:
+        score -= 10
+
+    # Moving average scoring
+    if price > sma_20 > sma_50:
+        score += 20
+    elif price < sma_20 < sma_50:
+        score -= 20
+    elif price > sma_20:
+        score += 10
+
+    # Signal-based adjustments
+    score += -15 * n_overbought + 10 * n_oversold + 5 * n_bullish - 5 * n_bearish
+
+    # Normalize to 0-100 tenths
+    return max(0, min(100, score))
+
+
 def calculate_technical_score(indicators: dict, signals: list) -> tuple:
     """Calculate technical component of confidence (0-10)"""
-    score = 5  # Start neutral
-    breakdown = []
-    
     rsi = indicators.get("rsi", 50)
     macd_hist = indicators.get("macd_hist", 0)
     price = indicators.get("price", 0)
     sma_20 = indicators.get("sma_20", 0)
     sma_50 = indicators.get("sma_50", 0)
-    
-    # RSI scoring
+
+    # Count signal adjustments (each signal matches at most one class)
+    n_overbought = sum(1 for s in signals if "OVERBOUGHT" in s)
+    n_oversold = sum(1 for s in signals if "OVERSOLD" in s)
+    n_bullish = sum(1 for s in signals if "BULLISH" in s and s != "MACD_BULLISH")
+    n_bearish = sum(1 for s in signals if "BEARISH" in s and s != "MACD_BEARISH")
+
+    score = _tech_score_core(
+        float(rsi), float(macd_hist), float(price), float(sma_20), float(sma_50),
+        n_overbought, n_oversold, n_bullish, n_bearish
+    ) / 10.0
+
+    # Human-readable breakdown mirrors the core's branches
+    breakdown = []
     if 40 <= rsi <= 60:
-        score += 1.5
         breakdown.append(f"RSI sweet spot (50): +1.5")
     elif rsi < 30:
-        score += 3  # Oversold = potential upside
         breakdown.append(f"RSI oversold ({rsi}): +3")
     elif rsi < 40:
-        score += 1.5
         breakdown.append(f"RSI low ({rsi}): +1.5")
     elif rsi > 75:
-        score -= 3
         breakdown.append(f"RSI overbought ({rsi}): -3")
     elif rsi > 65:
-        score -= 1.5
         breakdown.append(f"RSI high ({rsi}): -1.5")
-    
-    # MACD scoring
+
     if macd_hist > 0:
-        score += 1
         breakdown.append(f"MACD bullish: +1")
     else:
-        score -= 1
         breakdown.append(f"MACD bearish: -1")
-    
-    # Moving average scoring
+
     if price > sma_20 > sma_50:
-        score += 2
         breakdown.append(f"Uptrend (price>MA20>MA50): +2")
     elif price < sma_20 < sma_50:
-        score -= 2
         breakdown.append(f"Downtrend: -2")
     elif price > sma_20:
-        score += 1
         breakdown.append(f"Above SMA20: +1")
-    
-    # Signal-based adjustments
+
     for sig in signals:
         if "OVERBOUGHT" in sig:
-            score -= 1.5
             breakdown.append(f"{sig}: -1.5")
         elif "OVERSOLD" in sig:
-            score += 1
             breakdown.append(f"{sig}: +1")
         elif "BULLISH" in sig and sig != "MACD_BULLISH":
-            score += 0.5
             breakdown.append(f"{sig}: +0.5")
         elif "BEARISH" in sig and sig != "MACD_BEARISH":
-            score -= 0.5
             breakdown.append(f"{sig}: -0.5")
-    
-    # Normalize to 0-10
-    score = max(0, min(10, score))
+
     return round(score, 1), breakdown
 
 
 def calculate_fundamental_score(fundamentals: dict) -> tuple:
     """Calculate fundamental component of confidence (0-10)"""
-    score = 5  # Start neutral
+    score = 50  # Start neutral; integer tenths, divided by 10 at the end
     breakdown = []
-    
+
     data = fundamentals.get("data", {})
     if not data:
         return 5.0, ["No fundamentals available: 5"]
-    
+
     # Revenue check
     revenue = data.get("revenue_billions", 0)
     if revenue > 50:  # Large cap
-        score += 1.5
+        score += 15
         breakdown.append(f"Large cap revenue (${revenue}B): +1.5")
     elif revenue > 10:
-        score += 1
+        score += 10
         breakdown.append(f"Mid cap revenue (${revenue}B): +1")
-    
+
     # Gross margin
     gross_margin = data.get("gross_margin_pct", 0)
     if gross_margin > 60:
-        score += 2
+        score += 20
         breakdown.append(f"High margin ({gross_margin}%): +2")
     elif gross_margin > 50:
-        score += 1
+        score += 10
         breakdown.append(f"Good margin ({gross_margin}%): +1")
     elif gross_margin < 20:
-        score -= 2
+        score -= 20
         breakdown.append(f"Low margin ({gross_margin}%): -2")
-    
+
     # EPS guidance
     eps_guidance = data.get("eps_guidance")
     eps = data.get("eps", 0)
-    
+
     if eps_guidance and eps:
         if eps_guidance > eps:
-            score += 2.5
+            score += 25
             breakdown.append(f"Raising guidance ({eps}->{eps_guidance}): +2.5")
         elif eps_guidance < eps * 0.9:
-            score -= 3
+            score -= 30
             breakdown.append(f"Guidance cut: -3")
         else:
-            score += 1
+            score += 10
             breakdown.append(f"Stable guidance: +1")
-    
+
     # EPS positive
     if eps and eps > 0:
-        score += 1
+        score += 10
         breakdown.append(f"Positive EPS ({eps}): +1")
-    
+
     # Operating income positive
     op_income = data.get("operating_income_billions", 0)
     if op_income > 0:
-        score += 1
+        score += 10
         breakdown.append(f"Operating profit: +1")
-    
+
     # Normalize
-    score = max(0, min(10, score))
-    return round(score, 1), breakdown
+    score = max(0, min(100, score))
+    return score / 10.0, breakdown
 
 
 def calculate_sentiment_score(news: list) -> tuple:
     """Calculate sentiment component of confidence (0-10)"""
-    score = 5  # Start neutral
+    score = 50  # Start neutral; integer tenths, divided by 10 at the end
     breakdown = []
     
     if not news:
         return 5.0, ["No news: 5"]
     
-    positive_keywords = ["beat", "raise", "growth", "bullish", "upgrade", "profit", "soar", "rally", "record"]
-    negative_keywords = ["miss", "cut", "downgrade", "loss", "fear", "crash", "plunge", "warning", "layoff"]
-    
     positive_count = 0
     negative_count = 0
-    
+
     for article in news:
-        title = (article.get("title", "") + " " + article.get("content", "")).lower()
-        
-        for kw in positive_keywords:
-            if kw in title:
-                positive_count += 1
-                break
-        for kw in negative_keywords:
-            if kw in title:
-                negative_count += 1
-                break
+        # Concatenate+lowercase once per article and stash it on the dict,
+        # so rescoring the same article never redoes the allocation
+        blob = article.get("_blob")
+        if blob is None:
+            blob = (article.get("title", "") + " " + article.get("content", "")).lower()
+            article["_blob"] = blob
+
+        if _KEYWORD_AUTOMATON is not None:
+            # Single DFA pass over the text covers all keywords at once
+            hits = {kind for _, kind in _KEYWORD_AUTOMATON.iter(blob)}
+            positive_count += "pos" in hits
+            negative_count += "neg" in hits
+        else:
+            for kw in POSITIVE_KEYWORDS:
+                if kw in blob:
+                    positive_count += 1
+                    break
+            for kw in NEGATIVE_KEYWORDS:
+                if kw in blob:
+                    negative_count += 1
+                    break
     
     if positive_count > negative_count:
-        score += min(3, positive_count - negative_count)
+        score += 10 * min(3, positive_count - negative_count)
         breakdown.append(f"Positive news ({positive_count}): +{min(3, positive_count - negative_count)}")
     elif negative_count > positive_count:
-        score -= min(3, negative_count - positive_count)
+        score -= 10 * min(3, negative_count - positive_count)
         breakdown.append(f"Negative news ({negative_count}): -{min(3, negative_count - positive_count)}")
-    
-    score = max(0, min(10, score))
-    return round(score, 1), breakdown
+
+    score = max(0, min(100, score))
+    return score / 10.0, breakdown
 
 
 def calculate_confidence_score(holding: dict, fundamentals: dict) -> dict:
@@ -323,16 +415,23 @@ def synthesize_portfolio() -> dict:
             }
         ]
     
+    # Load every fundamentals file once up front instead of a fresh
+    # open+parse per holding inside the loop
+    fund_cache = {}
+    if FUNDAMENTALS_DIR.exists():
+        for fund_file in FUNDAMENTALS_DIR.glob("*.json"):
+            try:
+                fund_cache[fund_file.stem] = _read_json(fund_file)
+            except (ValueError, OSError) as e:
+                print(f"[Synthesis] Skipping {fund_file.name}: {e}")
+
     # Analyze each holding
     results = []
     for holding in holdings:
         ticker = holding.get("ticker")
-        
-        # Load fundamentals
-        fundamentals = load_fundamentals(ticker)
-        
+
         # Calculate confidence
-        analysis = calculate_confidence_score(holding, fundamentals)
+        analysis = calculate_confidence_score(holding, fund_cache.get(ticker, {}))
         results.append(analysis)
     
     # Sort by confidence
@@ -359,8 +458,11 @@ def synthesize_portfolio() -> dict:
     }
     
     # Save report
-    with open(OUTPUT_FILE, "w") as f:
-        json.dump(synthesis, f, indent=2)
+    if HAS_ORJSON:
+        OUTPUT_FILE.write_bytes(orjson.dumps(synthesis, option=orjson.OPT_INDENT_2))
+    else:
+        with open(OUTPUT_FILE, "w") as f:
+            json.dump(synthesis, f, indent=2)
     
     print(f"[Synthesis] Saved to {OUTPUT_FILE}")
     print(f"[Synthesis] A-rated: {len(a_rated)}, Watch: {len(watch_list)}, Sell: {len(sell_candidates)}")
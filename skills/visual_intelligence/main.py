@@ -4,20 +4,98 @@ Visual Intelligence Skill
 Generates portfolio visualizations using matplotlib
 """
 
+import functools
+import hashlib
+import io
+import multiprocessing
 import os
 import json
-import pandas as pd
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 
-# Matplotlib for charts
-import matplotlib.pyplot as plt
-import matplotlib.patches as mpatches
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+
+# Matplotlib is imported lazily on first render - importing this module
+# just to call get_chart_for_discord() (a pure path lookup) shouldn't pay
+# matplotlib's several-hundred-ms import cost
+@functools.cache
+def _plt():
+    import matplotlib
+    # Headless cron job: select Agg before pyplot can probe for a GUI
+    # backend, and opt into the cheaper render path
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    plt.style.use("fast")
+    matplotlib.rcParams["path.simplify"] = True
+    matplotlib.rcParams["path.simplify_threshold"] = 1.0
+    matplotlib.rcParams["agg.path.chunksize"] = 10000
+    return plt
 
 # Config
 OUTPUT_DIR = Path(__file__).parent.parent.parent / "outputs"
 OUTPUT_DIR.mkdir(exist_ok=True)
 PORTFOLIO_FILE = Path(__file__).parent.parent.parent / "portfolio_split.json"
 
+# Output-level memoization: the hash of the portfolio that produced the
+# current PNGs, so a re-triggered run with no new trades skips rendering
+CACHE_KEY_FILE = OUTPUT_DIR / ".cache_key"
+
+# Discord renders the attachments at chat width anyway, so 96 dpi is
+# indistinguishable there while encoding ~2.5x fewer pixels than 150
+DPI = int(os.environ.get("CHART_DPI", "96"))
+CHART_FILES = {
+    "sector_heatmap": "sector_heatmap.png",
+    "holdings_pie": "holdings_pie.png",
+    "holdings_bars": "holdings_bars.png",
+}
+
+# Reusable figure pool - plt.subplots() + plt.close() per chart re-runs
+# Agg canvas setup, font lookup and tick locator construction every render,
+# which dominates at this dataset size. Figures are keyed by figsize and
+# cleared between runs. Set CHART_FIG_CACHE=0 for fresh figures.
+_FIG_CACHE = {}
+
+
+def _get_fig(figsize) -> tuple:
+    """Return a cleared (fig, ax) for figsize, reusing pooled figures"""
+    plt = _plt()
+    if os.environ.get("CHART_FIG_CACHE", "1") == "0":
+        return plt.subplots(figsize=figsize)
+    fig = _FIG_CACHE.get(figsize)
+    if fig is None:
+        fig = plt.figure(figsize=figsize)
+        _FIG_CACHE[figsize] = fig
+    fig.clf()
+    ax = fig.add_subplot(111)
+    return fig, ax
+
+
+def _release_fig(fig):
+    """Close the figure unless it lives in the reuse pool"""
+    if fig not in _FIG_CACHE.values():
+        _plt().close(fig)
+
+
+@functools.lru_cache(maxsize=32)
+def _cmap_colors(name: str, n: int, lo: float = 0.0, hi: float = 1.0):
+    """Sample n colors from the named colormap, cached - the palette only
+    depends on the series length, which rarely changes between runs"""
+    cmap = getattr(_plt().cm, name)
+    return cmap([lo + (hi - lo) * i / n for i in range(n)])
+
+
+def _save_fig(fig, output_path):
+    """Encode the PNG in memory, then write it with a single write_bytes"""
+    buf = io.BytesIO()
+    fig.savefig(buf, format="png", dpi=DPI, pil_kwargs={"compress_level": 1})
+    Path(output_path).write_bytes(buf.getbuffer())
+
+
 # Sector mapping
 SECTOR_MAP = {
     "MSFT": "Technology",
@@ -67,8 +145,8 @@ def load_portfolio_data() -> dict:
             ]
         }
     
-    with open(PORTFOLIO_FILE) as f:
-        return json.load(f)
+    data = PORTFOLIO_FILE.read_bytes()
+    return orjson.loads(data) if HAS_ORJSON else json.loads(data)
 
 
 def generate_sector_heatmap(portfolio: dict) -> str:
@@ -77,39 +155,39 @@ def generate_sector_heatmap(portfolio: dict) -> str:
     if not holdings:
         return ""
     
-    # Add sectors
+    # Aggregate by sector - a plain dict walk beats DataFrame construction
+    # plus groupby machinery at ~20 holdings
+    agg = {}
     for h in holdings:
-        h["sector"] = SECTOR_MAP.get(h["ticker"], "Other")
-    
-    df = pd.DataFrame(holdings)
-    sector_df = df.groupby("sector").agg({
-        "value": "sum",
-        "pct": "sum"
-    }).reset_index()
-    sector_df = sector_df.sort_values("value", ascending=True)
-    
+        # generate_all_charts pre-tags sectors; fall back for direct callers
+        sector = h.get("sector") or SECTOR_MAP.get(h["ticker"], "Other")
+        value, pct = agg.get(sector, (0.0, 0.0))
+        agg[sector] = (value + h.get("value", 0), pct + h.get("pct", 0))
+
+    items = sorted(agg.items(), key=lambda kv: kv[1][0])
+    sectors = [sector for sector, _ in items]
+    values = [value for _, (value, _) in items]
+    pcts = [pct for _, (_, pct) in items]
+
     # Create horizontal bar chart
-    fig, ax = plt.subplots(figsize=(10, 6))
-    
-    colors = plt.cm.viridis([i/len(sector_df) for i in range(len(sector_df))])
-    
-    bars = ax.barh(sector_df["sector"], sector_df["value"], color=colors)
-    
-    # Add value labels
-    for bar, pct in zip(bars, sector_df["pct"]):
-        width = bar.get_width()
-        ax.text(width + 50, bar.get_y() + bar.get_height()/2, 
-                f'£{width:,.0f} ({pct:.1f}%)', 
-                va='center', fontsize=10)
-    
+    fig, ax = _get_fig((10, 6))
+
+    colors = _cmap_colors("viridis", len(sectors))
+
+    bars = ax.barh(sectors, values, color=colors)
+
+    # Add value labels - one bar_label call instead of a Text artist loop
+    labels = [f'£{v:,.0f} ({p:.1f}%)' for v, p in zip(values, pcts)]
+    ax.bar_label(bars, labels=labels, padding=3, fontsize=10)
+
     ax.set_xlabel('Value (£)', fontsize=12)
     ax.set_title(f'Sector Allocation - {portfolio.get("timestamp", "")}', fontsize=14, fontweight='bold')
-    ax.set_xlim(0, sector_df["value"].max() * 1.3)
+    ax.set_xlim(0, max(values) * 1.3)
     
-    plt.tight_layout()
+    fig.tight_layout()
     output_path = OUTPUT_DIR / "sector_heatmap.png"
-    plt.savefig(str(output_path), dpi=150, bbox_inches='tight')
-    plt.close()
+    _save_fig(fig, output_path)
+    _release_fig(fig)
     
     print(f"[Visual] Sector chart saved to {output_path}")
     return str(output_path)
@@ -136,9 +214,9 @@ def generate_holdings_pie(portfolio: dict) -> str:
     tickers = [h["ticker"] for h in top_8]
     values = [h["value"] for h in top_8]
     
-    fig, ax = plt.subplots(figsize=(10, 8))
-    
-    colors = plt.cm.Set3([i/len(tickers) for i in range(len(tickers))])
+    fig, ax = _get_fig((10, 8))
+
+    colors = _cmap_colors("Set3", len(tickers))
     
     wedges, texts, autotexts = ax.pie(
         values, 
@@ -158,10 +236,10 @@ def generate_holdings_pie(portfolio: dict) -> str:
     
     ax.set_title(f'Holdings Breakdown - {portfolio.get("timestamp", "")}', fontsize=14, fontweight='bold')
     
-    plt.tight_layout()
+    fig.tight_layout()
     output_path = OUTPUT_DIR / "holdings_pie.png"
-    plt.savefig(str(output_path), dpi=150, bbox_inches='tight')
-    plt.close()
+    _save_fig(fig, output_path)
+    _release_fig(fig)
     
     print(f"[Visual] Pie chart saved to {output_path}")
     return str(output_path)
@@ -177,21 +255,18 @@ def generate_performance_bars(portfolio: dict) -> str:
     values = [h["value"] for h in holdings]
     pct = [h.get("pct", 0) for h in holdings]
     
-    fig, ax1 = plt.subplots(figsize=(12, 6))
-    
+    fig, ax1 = _get_fig((12, 6))
+
     # Bar chart for value
-    colors = plt.cm.Blues([0.3 + 0.7*i/len(tickers) for i in range(len(tickers))])
+    colors = _cmap_colors("Blues", len(tickers), lo=0.3)
     bars = ax1.bar(tickers, values, color=colors, alpha=0.8, label='Value (£)')
     ax1.set_xlabel('Ticker', fontsize=12)
     ax1.set_ylabel('Value (£)', fontsize=12, color='blue')
     ax1.tick_params(axis='y', labelcolor='blue')
     
     # Add value labels on bars
-    for bar in bars:
-        height = bar.get_height()
-        ax1.text(bar.get_x() + bar.get_width()/2., height,
-                f'£{height:,.0f}',
-                ha='center', va='bottom', fontsize=8, rotation=45)
+    ax1.bar_label(bars, labels=[f'£{v:,.0f}' for v in values],
+                  fontsize=8, rotation=45)
     
     # Second y-axis for percentage
     ax2 = ax1.twinx()
@@ -199,18 +274,20 @@ def generate_performance_bars(portfolio: dict) -> str:
     ax2.set_ylabel('% of Portfolio', fontsize=12, color='orange')
     ax2.tick_params(axis='y', labelcolor='orange')
     
-    plt.title(f'Top Holdings - {portfolio.get("timestamp", "")}', fontsize=14, fontweight='bold')
-    plt.xticks(rotation=45, ha='right')
+    # Address our axes directly - with pooled figures the pyplot "current
+    # axes" can point elsewhere
+    ax1.set_title(f'Top Holdings - {portfolio.get("timestamp", "")}', fontsize=14, fontweight='bold')
+    _plt().setp(ax1.get_xticklabels(), rotation=45, ha='right')
     
     # Combined legend
     lines1, labels1 = ax1.get_legend_handles_labels()
     lines2, labels2 = ax2.get_legend_handles_labels()
     ax1.legend(lines1 + lines2, labels1 + labels2, loc='upper right')
     
-    plt.tight_layout()
+    fig.tight_layout()
     output_path = OUTPUT_DIR / "holdings_bars.png"
-    plt.savefig(str(output_path), dpi=150, bbox_inches='tight')
-    plt.close()
+    _save_fig(fig, output_path)
+    _release_fig(fig)
     
     print(f"[Visual] Bar chart saved to {output_path}")
     return str(output_path)
@@ -220,7 +297,29 @@ def generate_all_charts() -> dict:
     """Generate all visualizations"""
     print("[Visual] Loading portfolio data...")
     portfolio = load_portfolio_data()
-    
+
+    # Same portfolio JSON -> same PNGs, so reuse the existing outputs when
+    # nothing changed since the last render
+    key = hashlib.blake2b(
+        json.dumps(portfolio, sort_keys=True).encode(), digest_size=16
+    ).hexdigest()
+    chart_paths = {name: OUTPUT_DIR / fname for name, fname in CHART_FILES.items()}
+    try:
+        cached_key = CACHE_KEY_FILE.read_text().strip()
+    except OSError:
+        cached_key = ""
+    if cached_key == key and all(p.exists() for p in chart_paths.values()):
+        print("[Visual] Portfolio unchanged - reusing existing charts")
+        return {
+            "portfolio": portfolio,
+            "charts": {name: str(p) for name, p in chart_paths.items()}
+        }
+
+    # ticker -> sector is deterministic, so annotate each holding once here
+    # rather than once per chart
+    for h in portfolio.get("holdings", []):
+        h.setdefault("sector", SECTOR_MAP.get(h["ticker"], "Other"))
+
     results = {
         "portfolio": portfolio,
         "charts": {}
@@ -233,15 +332,35 @@ def generate_all_charts() -> dict:
         ("holdings_bars", generate_performance_bars)
     ]
     
-    for name, func in chart_funcs:
+    # The generators share the input dict but write disjoint files, so
+    # render them on separate cores; the Agg backend is process-safe and
+    # rendering + PNG encoding dominates each call. Spawn rather than
+    # fork: the pipeline calls this from a thread, and forking a
+    # multi-threaded process can hand workers permanently-held stdio/SSL
+    # locks. The generators are module-level, so they pickle fine.
+    with ProcessPoolExecutor(
+        max_workers=len(chart_funcs),
+        mp_context=multiprocessing.get_context("spawn")
+    ) as ex:
+        futures = {ex.submit(func, portfolio): name for name, func in chart_funcs}
+        for fut in as_completed(futures):
+            name = futures[fut]
+            try:
+                path = fut.result()
+                if path:
+                    results["charts"][name] = path
+            except Exception as e:
+                print(f"[Visual] Error generating {name}: {e}")
+                results["charts"][name] = None
+
+    # Only record the key once every chart rendered, so a partial failure
+    # retries next run
+    if all(results["charts"].get(name) for name in CHART_FILES):
         try:
-            path = func(portfolio)
-            if path:
-                results["charts"][name] = path
-        except Exception as e:
-            print(f"[Visual] Error generating {name}: {e}")
-            results["charts"][name] = None
-    
+            CACHE_KEY_FILE.write_text(key)
+        except OSError:
+            pass
+
     return results
 
 
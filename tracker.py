@@ -7,16 +7,97 @@ Advanced Trading212 Portfolio Tracker
 - Generates daily report
 """
 
+import functools
 import os
 import json
 import requests
+import numpy as np
 import pandas as pd
 import yfinance as yf
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from ta.momentum import RSIIndicator
-from ta.trend import MACD, SMAIndicator, EMAIndicator
 import tavily
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+try:
+    import requests_cache
+    HAS_REQUESTS_CACHE = True
+except ImportError:
+    HAS_REQUESTS_CACHE = False
+
+try:
+    import httpx
+    HAS_HTTPX = True
+except ImportError:
+    HAS_HTTPX = False
+
+
+@functools.cache
+def _discord_client():
+    """Client for Discord posts - httpx with HTTP/2 when installed,
+    otherwise a pooled requests.Session; either way the TLS handshake to
+    discord.com happens once across all posts in a run"""
+    if HAS_HTTPX:
+        try:
+            return httpx.Client(http2=True, timeout=10.0)
+        except ImportError:  # h2 extra not installed
+            return httpx.Client(timeout=10.0)
+    return requests.Session()
+
+
+def _write_json(path: str, obj):
+    """Write obj as indented JSON (orjson fast path when installed)"""
+    if HAS_ORJSON:
+        with open(path, "wb") as f:
+            f.write(orjson.dumps(
+                obj,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY,
+                default=str
+            ))
+    else:
+        with open(path, "w") as f:
+            json.dump(obj, f, indent=2, default=str)
+
+
+def _parse_response(resp):
+    """Decode a JSON response body (orjson skips requests' text decode)"""
+    return orjson.loads(resp.content) if HAS_ORJSON else resp.json()
+
+# Optional numba JIT for the indicator recurrences; without it the
+# decorator is a no-op and the pure-Python loops run as-is
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+    def njit(*args, **kwargs):
+        def wrap(func):
+            return func
+        if args and callable(args[0]):
+            return args[0]
+        return wrap
+
+
+@functools.cache
+def _yf_session():
+    """HTTP cache for Yahoo requests when requests-cache is installed.
+
+    Same-day reruns (e.g. during development) hit the SQLite cache instead
+    of the network. Scoped to yfinance via the session kwarg rather than
+    install_cache() so T212 and Discord requests are never cached.
+    """
+    if not HAS_REQUESTS_CACHE:
+        return None
+    return requests_cache.CachedSession(
+        "/tmp/yf_cache", backend="sqlite", expire_after=3600
+    )
+
 # Trading212 credentials - load from environment
 import os
 T212_INVEST_KEY = os.getenv("T212_INVEST_KEY", "")
@@ -41,67 +122,94 @@ STOCKS = [
     "VUSA", "VFEM", "COPX"
 ]
 
+# Company names for news search
+COMPANY_NAMES = {
+    "MSFT": "Microsoft", "NVDA": "NVIDIA", "META": "Meta Facebook",
+    "GOOGL": "Alphabet Google", "AMD": "AMD", "ASML": "ASML",
+    "AVGO": "Broadcom", "AMZN": "Amazon", "UBER": "Uber",
+    "ORCL": "Oracle", "TTD": "Trade Desk", "NWG": "NatWest",
+    "BARC": "Barclays", "CELH": "Celsius Holdings", "NBIS": "Nebius",
+    "ZENA": "ZenaTech", "ALT": "Altimmune", "VUSA": "Vanguard S&P 500",
+    "VFEM": "Vanguard EM", "COPX": "Copper Miners"
+}
+
+# Yahoo Finance ticker mapping
+YAHOO_TICKERS = {
+    "NWG": "NWG.L", "BARC": "BARC.L", "VUSA": "VUSA.L", "VFEM": "VFEM.L"
+}
+
+# Report output paths
+PORTFOLIO_SPLIT_FILE = "/home/node/.openclaw/workspace/portfolio/portfolio_split.json"
+DAILY_REPORT_FILE = "/home/node/.openclaw/workspace/portfolio/daily_report.json"
+
+# Shared session for the T212 endpoints - both accounts hit the same
+# host, so the TLS connection is set up once and reused. Pool sized for
+# the four endpoint calls analyze_portfolio issues at once.
+_t212_session = requests.Session()
+_t212_session.mount(
+    "https://",
+    requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=4)
+)
+
+
+# Ticker mapping for UK/EU stocks
+# Format: T212 ticker -> Yahoo Finance ticker
+TICKER_MAP = {
+    "VFEGl_EQ": "VFEM.L",
+    "COPXl_EQ": "COPX.L",
+    "VUAGl_EQ": "VUSA.L",
+    "NWGl_EQ": "NWG.L",
+    "BARCl_EQ": "BARC.L",
+    "RBSl_EQ": "NWG.L",  # RBS -> NatWest
+}
+
+# Handle US stocks - convert to standard format
+# FB_US -> META, AMZ -> AMZN, etc.
+KNOWN_US = {
+    "FB": "META",
+    "AMZ": "AMZN",
+    "NVD": "NVDA",
+    "MSF": "MSFT",
+    "ASM": "ASML",
+    "TT8": "TTD",
+    "UT8": "UBER",
+    "ABE": "ABEA",  # maybe typo
+    "ORC": "ORCL",
+    "ORCd": "ORCL",
+    "YND": "YNDX",
+    "1YD": "YNDX",
+    "FB2A": "META",
+}
+
+
+@functools.lru_cache(maxsize=256)
+def parse_ticker(ticker_full: str) -> str:
+    """Parse T212 ticker format to standard ticker"""
+    # Check mapping first
+    if ticker_full in TICKER_MAP:
+        return TICKER_MAP[ticker_full]
+
+    # Parse: AMDd_EQ -> AMD, FB_US_EQ -> META, etc.
+    base = ticker_full.split("_")[0]
+
+    # Remove trailing d/l from UK stocks (AMDd -> AMD, BARCl -> BARC)
+    if base.endswith("d") or base.endswith("l"):
+        base = base[:-1]
+
+    if base in KNOWN_US:
+        return KNOWN_US[base]
+
+    return base
+
+
 def get_t212_holdings(key_id: str, secret: str) -> list:
     """Fetch holdings from Trading212 API v0"""
-    import base64
-    
     url = "https://live.trading212.com/api/v0/equity/positions"
-    credentials = base64.b64encode(f"{key_id}:{secret}".encode()).decode()
-    headers = {
-        "Authorization": f"Basic {credentials}"
-    }
-    
-    # Ticker mapping for UK/EU stocks
-    # Format: T212 ticker -> Yahoo Finance ticker
-    ticker_map = {
-        "VFEGl_EQ": "VFEM.L",
-        "COPXl_EQ": "COPX.L",
-        "VUAGl_EQ": "VUSA.L",
-        "NWGl_EQ": "NWG.L",
-        "BARCl_EQ": "BARC.L",
-        "RBSl_EQ": "NWG.L",  # RBS -> NatWest
-    }
-    
-    def parse_ticker(ticker_full: str) -> str:
-        """Parse T212 ticker format to standard ticker"""
-        # Check mapping first
-        if ticker_full in ticker_map:
-            return ticker_map[ticker_full]
-        
-        # Parse: AMDd_EQ -> AMD, FB_US_EQ -> META, etc.
-        base = ticker_full.split("_")[0]
-        
-        # Remove trailing d/l from UK stocks (AMDd -> AMD, BARCl -> BARC)
-        if base.endswith("d") or base.endswith("l"):
-            base = base[:-1]
-        
-        # Handle US stocks - convert to standard format
-        # FB_US -> META, AMZ -> AMZN, etc.
-        known_us = {
-            "FB": "META",
-            "AMZ": "AMZN",
-            "NVD": "NVDA",
-            "MSF": "MSFT",
-            "ASM": "ASML",
-            "TT8": "TTD",
-            "UT8": "UBER",
-            "ABE": "ABEA",  # maybe typo
-            "ORC": "ORCL",
-            "ORCd": "ORCL",
-            "YND": "YNDX",
-            "1YD": "YNDX",
-            "FB2A": "META",
-        }
-        
-        if base in known_us:
-            return known_us[base]
-        
-        return base
-    
+
     try:
-        resp = requests.get(url, headers=headers, timeout=10)
+        resp = _t212_session.get(url, auth=(key_id, secret), timeout=10)
         if resp.status_code == 200:
-            positions = resp.json()
+            positions = _parse_response(resp)
             holdings = []
             for pos in positions:
                 instrument = pos.get("instrument", {})
@@ -131,42 +239,37 @@ def get_all_holdings() -> tuple:
     """Fetch holdings from both Invest and ISA accounts"""
     invest_holdings = get_t212_holdings(T212_INVEST_KEY, T212_INVEST_SECRET)
     isa_holdings = get_t212_holdings(T212_ISA_KEY, T212_ISA_SECRET)
-    
-    # Combine and deduplicate by ticker
-    combined = {}
-    
-    for h in invest_holdings:
-        ticker = h["ticker"]
-        if ticker in combined:
-            combined[ticker]["quantity"] += h["quantity"]
-            combined[ticker]["total_value"] += h["total_value"]
-        else:
-            combined[ticker] = h
-    
-    for h in isa_holdings:
-        ticker = h["ticker"]
-        if ticker in combined:
-            combined[ticker]["quantity"] += h["quantity"]
-            combined[ticker]["total_value"] += h["total_value"]
-        else:
-            combined[ticker] = h
-    
-    return list(combined.values()), len(invest_holdings), len(isa_holdings)
+    return _combine_holdings(invest_holdings, isa_holdings)
+
+
+def _combine_holdings(invest_holdings: list, isa_holdings: list) -> tuple:
+    """Combine and deduplicate holdings from both accounts by ticker"""
+    rows = invest_holdings + isa_holdings
+    if not rows:
+        return [], 0, 0
+
+    # One C-level groupby replaces the per-row dict lookup/update loops:
+    # quantity and value sum across accounts, everything else keeps the
+    # first account's fields as before
+    combined = pd.DataFrame(rows).groupby("ticker", as_index=False).agg({
+        "ticker_full": "first",
+        "quantity": "sum",
+        "average_price": "first",
+        "current_price": "first",
+        "company_name": "first",
+        "currency": "first",
+        "total_value": "sum",
+    })
+    return combined.to_dict("records"), len(invest_holdings), len(isa_holdings)
 
 def get_t212_account(key_id: str, secret: str) -> dict:
     """Fetch account cash balance"""
-    import base64
-    
     url = "https://live.trading212.com/api/v0/equity/account/cash"
-    credentials = base64.b64encode(f"{key_id}:{secret}".encode()).decode()
-    headers = {
-        "Authorization": f"Basic {credentials}"
-    }
-    
+
     try:
-        resp = requests.get(url, headers=headers, timeout=10)
+        resp = _t212_session.get(url, auth=(key_id, secret), timeout=10)
         if resp.status_code == 200:
-            return resp.json()
+            return _parse_response(resp)
         return {}
     except Exception as e:
         print(f"T212 account API error: {e}")
@@ -176,7 +279,10 @@ def get_all_account_totals() -> dict:
     """Get totals from both accounts using 'total' field (includes holdings + cash)"""
     invest_account = get_t212_account(T212_INVEST_KEY, T212_INVEST_SECRET)
     isa_account = get_t212_account(T212_ISA_KEY, T212_ISA_SECRET)
-    
+    return _account_totals(invest_account, isa_account)
+
+
+def _account_totals(invest_account: dict, isa_account: dict) -> dict:
     # Note: 'total' in T212 API = total account value (holdings + cash)
     # 'free' = available cash to invest
     return {
@@ -187,46 +293,148 @@ def get_all_account_totals() -> dict:
         "total_portfolio": (invest_account.get("total", 0) if invest_account else 0) + (isa_account.get("total", 0) if isa_account else 0)
     }
 
-def get_technical_indicators(ticker: str, yahoo_tickers: dict = None) -> dict:
-    """Calculate RSI, MACD, SMA, EMA for a ticker"""
+# Indicator state carried between runs: per ticker, the date of the last
+# bar and the indicators computed from it. Yesterday's values only change
+# when a new bar arrives, so intraday reruns skip the recomputation.
+INDICATOR_STATE_FILE = "/tmp/indicator_state.json"
+
+
+@functools.cache
+def _indicator_state() -> dict:
+    """Load the persisted per-ticker indicator state (empty on first run)"""
     try:
-        # Use mapped ticker for Yahoo if available
-        yf_ticker = yahoo_tickers.get(ticker, ticker) if yahoo_tickers else ticker
-        stock = yf.Ticker(yf_ticker)
-        df = stock.history(period="3mo")
-        
-        if df.empty or len(df) < 50:
+        with open(INDICATOR_STATE_FILE) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_indicator_state():
+    try:
+        with open(INDICATOR_STATE_FILE, "w") as f:
+            json.dump(_indicator_state(), f)
+    except OSError as e:
+        print(f"Indicator state save error: {e}")
+
+
+# Indicator recurrences on plain float64 arrays. The ta library built a
+# full pandas Series per indicator only for us to read .iloc[-1]; these
+# compute the same last values (ewm adjust=False / Wilder smoothing) in
+# one pass each.
+
+@njit(cache=True)
+def _ema_last(close, span: int) -> float:
+    """Last EMA value (pandas ewm(span, adjust=False) recurrence)"""
+    alpha = 2.0 / (span + 1.0)
+    ema = close[0]
+    for x in close[1:]:
+        ema = alpha * x + (1.0 - alpha) * ema
+    return ema
+
+
+@njit(cache=True)
+def _rsi_last(close, window: int) -> float:
+    """Last RSI value with Wilder smoothing (matches ta.RSIIndicator)"""
+    alpha = 1.0 / window
+    avg_gain = 0.0
+    avg_loss = 0.0
+    for i in range(1, len(close)):
+        diff = close[i] - close[i - 1]
+        gain = diff if diff > 0.0 else 0.0
+        loss = -diff if diff < 0.0 else 0.0
+        if i == 1:
+            avg_gain = gain
+            avg_loss = loss
+        else:
+            avg_gain = alpha * gain + (1.0 - alpha) * avg_gain
+            avg_loss = alpha * loss + (1.0 - alpha) * avg_loss
+    if avg_loss == 0.0:
+        return 100.0
+    return 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+
+
+@njit(cache=True)
+def _macd_last(close):
+    """Last (macd_line, signal, histogram) - EMA12/EMA26 plus EMA9 signal"""
+    a12 = 2.0 / 13.0
+    a26 = 2.0 / 27.0
+    a9 = 2.0 / 10.0
+    ema12 = close[0]
+    ema26 = close[0]
+    line = 0.0
+    signal = 0.0
+    for i, x in enumerate(close):
+        if i:
+            ema12 = a12 * x + (1.0 - a12) * ema12
+            ema26 = a26 * x + (1.0 - a26) * ema26
+        line = ema12 - ema26
+        signal = line if i == 0 else a9 * line + (1.0 - a9) * signal
+    return line, signal, line - signal
+
+
+def get_technical_indicators(ticker: str, yahoo_tickers: dict = None,
+                             history: pd.DataFrame = None) -> dict:
+    """Calculate RSI, MACD, SMA, EMA for a ticker
+
+    Pass history (a per-ticker OHLCV frame from a batched yf.download) to
+    skip the per-ticker network fetch; without it the old single-ticker
+    request is made.
+    """
+    try:
+        if history is not None:
+            df = history
+        else:
+            # Use mapped ticker for Yahoo if available
+            yf_ticker = yahoo_tickers.get(ticker, ticker) if yahoo_tickers else ticker
+            stock = yf.Ticker(yf_ticker, session=_yf_session())
+            df = stock.history(period="1y")
+
+        if df is None or df.empty or len(df) < 50:
             return None
-            
-        # Calculate indicators
-        close = df['Close']
-        
+
+        # Only these four columns are read below; dropping the rest frees
+        # the Open/Adj Close/Dividends/Splits allocations immediately
+        df = df[['Close', 'High', 'Low', 'Volume']]
+
+        # Calculate indicators on one float64 array
+        close = df['Close'].to_numpy(dtype=np.float64)
+
+        # Same latest bar as last run -> indicators are identical. The
+        # close is part of the key because yfinance's newest daily bar
+        # mutates intraday while its date stays the same; a refreshed
+        # price must invalidate the entry.
+        last_date = str(df.index[-1].date())
+        last_close = float(close[-1])
+        state = _indicator_state()
+        cached = state.get(ticker)
+        if (cached and cached.get("last_date") == last_date
+                and cached.get("last_close") == last_close):
+            return cached["indicators"]
+
         # RSI (14-day)
-        rsi = RSIIndicator(close, window=14).rsi().iloc[-1]
-        
+        rsi = _rsi_last(close, 14)
+
         # MACD
-        macd = MACD(close)
-        macd_line = macd.macd().iloc[-1]
-        macd_signal = macd.macd_signal().iloc[-1]
-        macd_hist = macd.macd_diff().iloc[-1]
-        
+        macd_line, macd_signal, macd_hist = _macd_last(close)
+
         # Moving Averages
-        sma_20 = SMAIndicator(close, window=20).sma_indicator().iloc[-1]
-        sma_50 = SMAIndicator(close, window=50).sma_indicator().iloc[-1]
-        ema_20 = EMAIndicator(close, window=20).ema_indicator().iloc[-1]
-        
+        sma_20 = close[-20:].mean()
+        sma_50 = close[-50:].mean()
+        ema_20 = _ema_last(close, 20)
+
         # Current price
-        current_price = close.iloc[-1]
-        
-        # Volume
-        volume = df['Volume'].iloc[-1]
-        avg_volume = df['Volume'].tail(20).mean()
+        current_price = close[-1]
         
+        # Volume - plain array slices, no per-call .tail() Series
+        vol = df['Volume'].to_numpy()
+        volume = vol[-1]
+        avg_volume = vol[-20:].mean()
+
         # 52-week high/low
-        year_high = df['High'].tail(252).max()
-        year_low = df['Low'].tail(252).min()
+        year_high = df['High'].to_numpy()[-252:].max()
+        year_low = df['Low'].to_numpy()[-252:].min()
         
-        return {
+        indicators = {
             "price": round(current_price, 2),
             "rsi": round(rsi, 2),
             "macd_line": round(macd_line, 4),
@@ -242,6 +450,12 @@ def get_technical_indicators(ticker: str, yahoo_tickers: dict = None) -> dict:
             "distance_from_high_pct": round((year_high - current_price) / year_high * 100, 1),
             "distance_from_low_pct": round((current_price - year_low) / year_low * 100, 1)
         }
+        state[ticker] = {
+            "last_date": last_date,
+            "last_close": last_close,
+            "indicators": indicators
+        }
+        return indicators
     except Exception as e:
         print(f"Error fetching {ticker}: {e}")
         return None
@@ -290,10 +504,72 @@ def get_signal(indicators: dict) -> tuple:
     else:
         return "NEUTRAL", signals
 
+@functools.cache
+def _tavily_client():
+    """Shared Tavily client - constructing one per search re-inits the
+    underlying HTTP session"""
+    return tavily.TavilyClient(api_key=TAVILY_API_KEY)
+
+
+def get_signals_batch(indicator_list: list) -> list:
+    """Classify many holdings in one vectorized pass
+
+    Returns [(signal, signals_list), ...] in input order, each element
+    matching what get_signal would produce. The threshold comparisons and
+    bull/bear tallies run as numpy array ops; only the signal-string
+    assembly stays per holding.
+    """
+    n = len(indicator_list)
+    if not n:
+        return []
+
+    rsi = np.fromiter((d.get("rsi", 50) for d in indicator_list), np.float64, n)
+    macd_hist = np.fromiter((d.get("macd_hist", 0) for d in indicator_list), np.float64, n)
+    price = np.fromiter((d.get("price", 0) for d in indicator_list), np.float64, n)
+    sma_20 = np.fromiter((d.get("sma_20", 0) for d in indicator_list), np.float64, n)
+    sma_50 = np.fromiter((d.get("sma_50", 0) for d in indicator_list), np.float64, n)
+
+    overbought = rsi > 75
+    oversold = rsi < 30
+    high = (rsi > 65) & ~overbought
+    low = (rsi < 40) & ~oversold
+    macd_bull = macd_hist > 0
+    trend_bull = (price > sma_20) & (sma_20 > sma_50)
+    trend_bear = (price < sma_20) & (sma_20 < sma_50)
+
+    bull = oversold.astype(np.int8) + low + macd_bull + trend_bull
+    bear = overbought.astype(np.int8) + high + ~macd_bull + trend_bear
+
+    out = []
+    for i in range(n):
+        signals = []
+        if overbought[i]:
+            signals.append("RSI_OVERBOUGHT")
+        elif oversold[i]:
+            signals.append("RSI_OVERSOLD")
+        elif high[i]:
+            signals.append("RSI_HIGH")
+        elif low[i]:
+            signals.append("RSI_LOW")
+        signals.append("MACD_BULLISH" if macd_bull[i] else "MACD_BEARISH")
+        if trend_bull[i]:
+            signals.append("BULLISH_TREND")
+        elif trend_bear[i]:
+            signals.append("BEARISH_TREND")
+
+        if bull[i] > bear[i]:
+            out.append(("BULLISH", signals))
+        elif bear[i] > bull[i]:
+            out.append(("BEARISH", signals))
+        else:
+            out.append(("NEUTRAL", signals))
+    return out
+
+
 def search_news(ticker: str, company_name: str) -> list:
     """Search for recent news on a stock using Tavily"""
     try:
-        client = tavily.TavilyClient(api_key=TAVILY_API_KEY)
+        client = _tavily_client()
         query = f"{ticker} {company_name} stock news 2025"
         # Use the newer search API
         results = client.search(query=query, max_results=2)
@@ -308,13 +584,34 @@ def search_news(ticker: str, company_name: str) -> list:
 
 def analyze_portfolio() -> dict:
     """Main analysis function - uses real T212 holdings from both accounts"""
-    # Fetch holdings from both Invest and ISA
+    # Idempotent reruns (e.g. a retry after a Discord failure) reuse
+    # today's report rather than re-fetching every API; FORCE=1 overrides
+    if os.environ.get("FORCE") != "1":
+        try:
+            mtime = datetime.fromtimestamp(os.path.getmtime(DAILY_REPORT_FILE))
+            if mtime.date() == datetime.now().date():
+                print("Report already generated today - reusing "
+                      "daily_report.json (set FORCE=1 to refresh)")
+                with open(DAILY_REPORT_FILE, "rb") as f:
+                    data = f.read()
+                return orjson.loads(data) if HAS_ORJSON else json.loads(data)
+        except (OSError, ValueError):
+            pass
+
+    # Fetch holdings and cash from both Invest and ISA - the four endpoint
+    # calls are independent, so issue them together and pay one round-trip
     print("Fetching holdings from Trading212...")
-    all_holdings, invest_count, isa_count = get_all_holdings()
-    
-    # Get cash from both accounts
-    account_totals = get_all_account_totals()
-    
+    with ThreadPoolExecutor(max_workers=4) as ex:
+        invest_pos = ex.submit(get_t212_holdings, T212_INVEST_KEY, T212_INVEST_SECRET)
+        isa_pos = ex.submit(get_t212_holdings, T212_ISA_KEY, T212_ISA_SECRET)
+        invest_acct = ex.submit(get_t212_account, T212_INVEST_KEY, T212_INVEST_SECRET)
+        isa_acct = ex.submit(get_t212_account, T212_ISA_KEY, T212_ISA_SECRET)
+
+        all_holdings, invest_count, isa_count = _combine_holdings(
+            invest_pos.result(), isa_pos.result()
+        )
+        account_totals = _account_totals(invest_acct.result(), isa_acct.result())
+
     print(f"Found {len(all_holdings)} total positions (Invest: {invest_count}, ISA: {isa_count})")
     
     report = {
@@ -343,34 +640,51 @@ def analyze_portfolio() -> dict:
     # Build ticker to holding mapping
     holding_map = {h["ticker"]: h for h in all_holdings}
     
-    # Company names for news search
-    company_names = {
-        "MSFT": "Microsoft", "NVDA": "NVIDIA", "META": "Meta Facebook",
-        "GOOGL": "Alphabet Google", "AMD": "AMD", "ASML": "ASML",
-        "AVGO": "Broadcom", "AMZN": "Amazon", "UBER": "Uber",
-        "ORCL": "Oracle", "TTD": "Trade Desk", "NWG": "NatWest",
-        "BARC": "Barclays", "CELH": "Celsius Holdings", "NBIS": "Nebius",
-        "ZENA": "ZenaTech", "ALT": "Altimmune", "VUSA": "Vanguard S&P 500",
-        "VFEM": "Vanguard EM", "COPX": "Copper Miners"
-    }
-    
-    # Yahoo Finance ticker mapping
-    yahoo_tickers = {
-        "NWG": "NWG.L", "BARC": "BARC.L", "VUSA": "VUSA.L", "VFEM": "VFEM.L"
-    }
-    
+    # One multi-symbol download replaces a history() request per ticker -
+    # yfinance batches the symbols and still fetches them threaded
+    print(f"Analyzing {len(tickers_to_analyze)} tickers...")
+    mapped = {t: YAHOO_TICKERS.get(t, t) for t in tickers_to_analyze}
+    data = yf.download(
+        sorted(set(mapped.values())), period="1y", group_by="ticker",
+        threads=True, progress=False, auto_adjust=False,
+        session=_yf_session()
+    )
+
+    indicator_map = {}
+    for ticker, yf_ticker in mapped.items():
+        try:
+            # Symbols that failed to download come back as all-NaN columns
+            hist = data[yf_ticker].dropna(how="all")
+        except KeyError:
+            hist = None
+        indicator_map[ticker] = get_technical_indicators(
+            ticker, YAHOO_TICKERS, history=hist
+        )
+    _save_indicator_state()
+
+    # News searches are the other per-ticker network cost - fan those out
+    # too, only for tickers whose indicators came back
+    successful = [t for t in tickers_to_analyze if indicator_map.get(t)]
+    signal_map = dict(zip(
+        successful,
+        get_signals_batch([indicator_map[t] for t in successful])
+    ))
+    with ThreadPoolExecutor(max_workers=8) as ex:
+        news_map = dict(zip(
+            successful,
+            ex.map(lambda t: search_news(t, COMPANY_NAMES.get(t, t)), successful)
+        ))
+
     for ticker in tickers_to_analyze:
-        print(f"Analyzing {ticker}...")
-        indicators = get_technical_indicators(ticker, yahoo_tickers)
-        
+        indicators = indicator_map.get(ticker)
+
         if not indicators:
             continue
             
-        signal, signals_list = get_signal(indicators)
-        
-        # Get news
-        company = company_names.get(ticker, ticker)
-        news = search_news(ticker, company)
+        signal, signals_list = signal_map[ticker]
+
+        company = COMPANY_NAMES.get(ticker, ticker)
+        news = news_map.get(ticker, [])
         
         # Get T212 holding info if available
         holding = holding_map.get(ticker, {})
@@ -409,8 +723,7 @@ def analyze_portfolio() -> dict:
         ]
     }
     
-    with open("/home/node/.openclaw/workspace/portfolio/portfolio_split.json", "w") as f:
-        json.dump(portfolio_split, f, indent=2)
+    _write_json(PORTFOLIO_SPLIT_FILE, portfolio_split)
     
     return report
 
@@ -425,20 +738,18 @@ def format_report(report: dict) -> str:
     lines.append(f"**Summary:** {report['summary']['bullish']} 🟢 Bullish | {report['summary']['neutral']} 🟡 Neutral | {report['summary']['bearish']} 🔴 Bearish")
     lines.append("")
     
-    # Categorize
-    bullish = [h for h in report['holdings'] if h['signal'] == "BULLISH"]
-    neutral = [h for h in report['holdings'] if h['signal'] == "NEUTRAL"]
-    bearish = [h for h in report['holdings'] if h['signal'] == "BEARISH"]
-    
-    # Overbought/Oversold alerts
+    # Overbought/Oversold alerts - one pass over the holdings buckets
+    # everything (the old per-signal list comprehensions re-read the same
+    # dicts three more times and their results were never used)
     alerts = []
     watch = []
     stable = []
-    
+
     for h in report['holdings']:
-        rsi = h['indicators']['rsi']
-        price = h['indicators']['price']
-        
+        ind = h['indicators']
+        rsi = ind['rsi']
+        price = ind['price']
+
         if rsi > 75:
             alerts.append(f"🔴 **{h['ticker']}** - RSI: {rsi} (OVERBOUGHT) | ${price}")
         elif rsi < 30:
@@ -475,24 +786,73 @@ def format_report(report: dict) -> str:
     
     return "\n".join(lines)
 
-def send_to_discord(message: str):
-    """Send report to Discord channel"""
+def build_discord_embeds(report: dict) -> list:
+    """Build an embed summarizing the report
+
+    Structured fields instead of one long content string, so a growing
+    portfolio doesn't run into Discord's 2000-char content cap.
+    """
+    summary = report.get('summary', {})
+    return [{
+        "title": f"Portfolio Analysis - {report.get('timestamp', '')}",
+        "description": (
+            f"{summary.get('bullish', 0)} bullish | "
+            f"{summary.get('neutral', 0)} neutral | "
+            f"{summary.get('bearish', 0)} bearish"
+        ),
+        "fields": [
+            {
+                "name": h['ticker'],
+                "value": f"RSI {h['indicators']['rsi']} | ${h['indicators']['price']}",
+                "inline": True
+            }
+            for h in report.get('holdings', [])[:25]  # Discord field limit
+        ]
+    }]
+
+
+def send_to_discord(message: str, file_paths: list = None, embeds: list = None):
+    """Send report to Discord channel, optionally with image attachments
+    and/or embeds"""
     if not DISCORD_TOKEN:
         print("No Discord token configured, skipping Discord notification")
         return
     if not DISCORD_CHANNEL_ID:
         print("No Discord channel ID configured, skipping Discord notification")
         return
-    
+
     url = f"https://discord.com/api/v10/channels/{DISCORD_CHANNEL_ID}/messages"
-    headers = {
-        "Authorization": f"Bot {DISCORD_TOKEN}",
-        "Content-Type": "application/json"
-    }
+    headers = {"Authorization": f"Bot {DISCORD_TOKEN}"}
+    # Discord rejects the whole request - embeds and attachments included -
+    # when content exceeds 2000 chars, so cap the text portion
+    if len(message) > 2000:
+        message = message[:1997] + "..."
     data = {"content": message}
-    
+    if embeds:
+        data["embeds"] = embeds[:10]
+
     try:
-        resp = requests.post(url, json=data, headers=headers)
+        if file_paths:
+            # One multipart request carries the message plus all attachments
+            # (Discord allows up to 10) instead of one POST per image
+            files = {}
+            opened = []
+            try:
+                for i, path in enumerate(file_paths[:10]):
+                    f = open(path, "rb")
+                    opened.append(f)
+                    files[f"files[{i}]"] = (os.path.basename(path), f)
+                resp = _discord_client().post(
+                    url,
+                    headers=headers,
+                    data={"payload_json": json.dumps(data)},
+                    files=files
+                )
+            finally:
+                for f in opened:
+                    f.close()
+        else:
+            resp = _discord_client().post(url, json=data, headers=headers)
         if resp.status_code == 200:
             print("✅ Report sent to Discord")
         else:
@@ -505,8 +865,7 @@ if __name__ == "__main__":
     report = analyze_portfolio()
     
     # Save JSON for debugging
-    with open("/home/node/.openclaw/workspace/portfolio/daily_report.json", "w") as f:
-        json.dump(report, f, indent=2, default=str)
+    _write_json(DAILY_REPORT_FILE, report)
     
     # Format and print report
     report_text = format_report(report)
@@ -516,4 +875,4 @@ if __name__ == "__main__":
     print("\nReport saved to daily_report.json")
     
     # Send to Discord
-    send_to_discord(report_text)
+    send_to_discord(report_text, embeds=build_discord_embeds(report))